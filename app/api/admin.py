@@ -1,68 +1,219 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List
 from ..models.assessment import QuestionModel, AssessmentResultResponse
 from ..models.user import UserResponse
-from ..core.database import get_database
+from ..core.database import get_collections
 from .deps import get_current_admin_user
 from ..utils.assessment import get_domain_ratings  # Ensure this import is present
+from .assessment import invalidate_questions_cache
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], default_response_class=ORJSONResponse)
 
 @router.post("/questions", response_model=QuestionModel)
 async def add_question(question: QuestionModel, admin_user=Depends(get_current_admin_user)):
-    db = get_database()
-    result = await db.questions.insert_one(question.dict())
+    cols = get_collections()
+    result = await cols.questions.insert_one(question.dict())
     question.id = result.inserted_id
+    invalidate_questions_cache()
     return question
 
-@router.get("/questions", response_model=List[QuestionModel])
-async def list_questions(admin_user=Depends(get_current_admin_user)):
-    db = get_database()
-    questions = await db.questions.find().to_list(length=1000)
-    return questions
-
-@router.get("/users", response_model=List[UserResponse])
-async def list_users(admin_user=Depends(get_current_admin_user)):
-    db = get_database()
-    users = await db.users.find().to_list(length=1000)
-    user_responses = []
-    for u in users:
-        user_responses.append(UserResponse(
-            id=str(u.get("_id")),
-            username=u.get("username", ""),
-            full_name=u.get("full_name", ""),
-            company=u.get("company", ""),
-            position=u.get("position", ""),
-            is_active=u.get("is_active", True),
-            is_verified=u.get("is_verified", False),
-            created_at=u.get("created_at"),
-            assessment_completed=u.get("assessment_completed", False),
-            assessment_started_at=u.get("assessment_started_at"),
-            assessment_completed_at=u.get("assessment_completed_at"),
-            role=u.get("role", "user")
-        ))
-    return user_responses
-
-@router.get("/users/{user_id}/assessments", response_model=List[AssessmentResultResponse])
-async def get_user_assessments(user_id: str, admin_user=Depends(get_current_admin_user)):
-    db = get_database()
-    results = await db.assessment_results.find({"user_id": user_id}).to_list(length=100)
-    response_list = []
+def _parse_sort(sort: str):
+    """Parse a '-field'/'field' sort param into (field, direction)."""
+    if sort.startswith("-"):
+        return sort[1:], -1
+    return sort, 1
+
+# Server-side projections so Mongo only ships the fields the response models
+# need (no hashed_password etc.) and _id arrives pre-stringified. Computing id
+# in the $project also overrides any stray ObjectId "id" key stored inside a
+# document (add_question inserts the model dump, embedded id included).
+QUESTION_PROJECTION = {
+    "$project": {
+        "id": {"$toString": "$_id"},
+        "question_text": 1,
+        "domain": 1,
+        "question_number": 1,
+        "is_active": 1,
+        "created_at": 1,
+        "type": 1,
+        "options": 1,
+        "_id": 0
+    }
+}
+
+USER_PROJECTION = {
+    "$project": {
+        "id": {"$toString": "$_id"},
+        "username": 1,
+        "full_name": 1,
+        "email": 1,
+        "phone": 1,
+        "company": 1,
+        "position": 1,
+        "is_active": 1,
+        "is_verified": 1,
+        "created_at": 1,
+        "assessment_completed": 1,
+        "assessment_started_at": 1,
+        "assessment_completed_at": 1,
+        "role": 1,
+        "_id": 0
+    }
+}
+
+ASSESSMENT_RESULT_PROJECTION = {
+    "$project": {
+        "id": {"$toString": "$_id"},
+        "user_data": {"$ifNull": ["$user_data", {}]},
+        "domain_scores": {"$ifNull": ["$domain_scores", {}]},
+        "descriptive_scores": {"$ifNull": ["$descriptive_scores", {}]},
+        "total_score": 1,
+        "overall_rating": 1,
+        "domain_ratings": {"$ifNull": ["$domain_ratings", {}]},
+        "started_at": 1,
+        "completed_at": 1,
+        "total_time_minutes": 1,
+        "created_at": 1,
+        "_id": 0
+    }
+}
+
+@router.get("/questions")
+async def list_questions(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    sort: str = Query("question_number"),
+    admin_user=Depends(get_current_admin_user)
+):
+    cols = get_collections()
+    field, direction = _parse_sort(sort)
+    cursor = await cols.questions.aggregate([
+        {"$sort": {field: direction, "_id": direction}},
+        {"$skip": skip},
+        {"$limit": limit},
+        QUESTION_PROJECTION
+    ])
+    questions = await cursor.to_list(length=limit)
+    return {"items": questions, "next_skip": skip + limit}
+
+@router.get("/users")
+async def list_users(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    sort: str = Query("-created_at"),
+    admin_user=Depends(get_current_admin_user)
+):
+    cols = get_collections()
+    field, direction = _parse_sort(sort)
+    cursor = await cols.users.aggregate([
+        {"$sort": {field: direction, "_id": direction}},
+        {"$skip": skip},
+        {"$limit": limit},
+        USER_PROJECTION
+    ])
+    users = await cursor.to_list(length=limit)
+    # The $project stage already shapes each doc like UserResponse, so the
+    # dicts go straight to serialization without a second validation pass.
+    return {"items": users, "next_skip": skip + limit}
+
+@router.get("/dashboard")
+async def dashboard(admin_user=Depends(get_current_admin_user)):
+    """Everything the admin landing page needs, fetched in one round trip.
+
+    Independent queries run concurrently via asyncio.gather; the results
+    summary uses a single $facet aggregation so the collection is scanned
+    once for all three sub-pipelines.
+    """
+    cols = get_collections()
+
+    async def recent_users():
+        cursor = await cols.users.aggregate([
+            {"$sort": {"created_at": -1, "_id": -1}},
+            {"$limit": 50},
+            USER_PROJECTION
+        ])
+        return await cursor.to_list(length=50)
+
+    async def results_summary():
+        cursor = await cols.assessment_results.aggregate([
+            {"$facet": {
+                "by_rating": [
+                    {"$group": {"_id": "$overall_rating", "count": {"$sum": 1}}}
+                ],
+                "avg_score": [
+                    {"$group": {"_id": None, "value": {"$avg": "$total_score"}}}
+                ],
+                "recent": [
+                    {"$sort": {"created_at": -1}},
+                    {"$limit": 10},
+                    ASSESSMENT_RESULT_PROJECTION
+                ]
+            }}
+        ])
+        docs = await cursor.to_list(length=1)
+        facets = docs[0] if docs else {"by_rating": [], "avg_score": [], "recent": []}
+        return {
+            "by_rating": {f["_id"]: f["count"] for f in facets["by_rating"]},
+            "avg_total_score": facets["avg_score"][0]["value"] if facets["avg_score"] else 0,
+            "recent_results": facets["recent"]
+        }
+
+    users, total_questions, summary = await asyncio.gather(
+        recent_users(),
+        cols.questions.count_documents({}),
+        results_summary()
+    )
+    return {
+        "recent_users": users,
+        "total_questions": total_questions,
+        "results_summary": summary
+    }
+
+@router.get("/results.ndjson")
+async def export_results_ndjson(admin_user=Depends(get_current_admin_user)):
+    """Stream every assessment result as NDJSON for exports.
+
+    Documents are serialized straight off the cursor, so memory stays
+    constant regardless of result count and the first rows go out
+    immediately. The JSON-array endpoints remain for the admin UI.
+    """
+    cols = get_collections()
+    cursor = await cols.assessment_results.aggregate([
+        {"$sort": {"created_at": -1}},
+        ASSESSMENT_RESULT_PROJECTION
+    ])
+
+    async def generate():
+        async for doc in cursor:
+            yield orjson.dumps(doc, default=str) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/users/{user_id}/assessments")
+async def get_user_assessments(
+    user_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    sort: str = Query("-created_at"),
+    admin_user=Depends(get_current_admin_user)
+):
+    cols = get_collections()
+    field, direction = _parse_sort(sort)
+    cursor = await cols.assessment_results.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$sort": {field: direction, "_id": direction}},
+        {"$skip": skip},
+        {"$limit": limit},
+        ASSESSMENT_RESULT_PROJECTION
+    ])
+    results = await cursor.to_list(length=limit)
     for r in results:
-        domain_ratings = r.get("domain_ratings")
-        if not domain_ratings and "domain_scores" in r:
-            domain_ratings = get_domain_ratings(r["domain_scores"])
-        response_list.append(AssessmentResultResponse(
-            id=str(r.get("_id")),
-            user_id=r.get("user_id", ""),
-            responses=r.get("responses", []),
-            domain_scores=r.get("domain_scores", {}),
-            total_score=r.get("total_score", 0),
-            overall_rating=r.get("overall_rating", ""),
-            domain_ratings=domain_ratings or {},
-            started_at=r.get("started_at"),
-            completed_at=r.get("completed_at"),
-            total_time_minutes=r.get("total_time_minutes", 0),
-            created_at=r.get("created_at")
-        ))
-    return response_list 
\ No newline at end of file
+        # Older results were stored before domain_ratings existed; rebuild them
+        # from the scores only when the document has neither field.
+        if not r["domain_ratings"] and r["domain_scores"]:
+            r["domain_ratings"] = get_domain_ratings(r["domain_scores"])
+    # Projected docs already match AssessmentResultResponse; skip re-validation.
+    return {"items": results, "next_skip": skip + limit} 
\ No newline at end of file
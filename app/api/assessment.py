@@ -1,63 +1,105 @@
+import asyncio
+import time
 from datetime import datetime
 from typing import List
+import ciso8601
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response
 from ..models.assessment import AssessmentResponse, AssessmentResultResponse, AssessmentSubmission
 from ..models.user import UserModel
 from ..services.assessment_service import AssessmentService
-from ..services.user_service import UserService
-from ..api.deps import get_current_active_user
-from ..core.database import get_database
+from ..api.deps import get_assessment_service, require_role
 
-router = APIRouter(prefix="/assessment", tags=["Assessment"])
+router = APIRouter(prefix="/assessment", tags=["Assessment"], default_response_class=ORJSONResponse)
+
+_DOMAINS = ("leadership", "accountability", "communication", "innovation", "sales", "ethics", "collaboration")
+_Q_FIELDS = ("id", "question_text", "question_number", "type")
+
+# In-process cache of the serialized /questions payload. Questions change
+# rarely, so the hot path returns prebuilt JSON bytes instead of rebuilding
+# the list and re-encoding on every request.
+QUESTIONS_CACHE_TTL_SECONDS = 30.0
+_questions_cache = {"payload": None, "expires": 0.0, "version": 0}
+_questions_cache_lock = asyncio.Lock()
+_questions_version = 0
+
+def invalidate_questions_cache():
+    """Force the next /questions request to rebuild its cached payload."""
+    global _questions_version
+    _questions_version += 1
+
+async def _build_questions_payload(service: AssessmentService) -> bytes:
+    questions = await service.get_questions()
 
-@router.get("/questions")
-async def get_assessment_questions():
-    """Get shuffled assessment questions (no authentication required)."""
-    assessment_service = AssessmentService()
-    questions = await assessment_service.get_questions()
-    
     # Remove domain information from questions for users
-    user_questions = []
-    for q in questions:
-        user_question = {
-            "id": q["id"],
-            "question_text": q["question_text"],
-            "question_number": q["question_number"],
-            "type": q["type"]
-        }
-        user_questions.append(user_question)
-    
-    return {
+    user_questions = [{k: q[k] for k in _Q_FIELDS} for q in questions]
+
+    return orjson.dumps({
         "questions": user_questions,
         "total_questions": len(user_questions),
-        "domains": ["leadership", "accountability", "communication", "innovation", "sales", "ethics", "collaboration"]
-    }
+        "domains": _DOMAINS
+    })
+
+@router.get("/questions")
+async def get_assessment_questions(service: AssessmentService = Depends(get_assessment_service)):
+    """Get shuffled assessment questions (no authentication required).
+
+    The response is cached in-process for a short TTL, so the shuffled order
+    is shared by requests within the same cache window.
+    """
+    now = time.monotonic()
+    if (
+        _questions_cache["payload"] is not None
+        and _questions_cache["expires"] > now
+        and _questions_cache["version"] == _questions_version
+    ):
+        return Response(content=_questions_cache["payload"], media_type="application/json")
+
+    async with _questions_cache_lock:
+        # Re-check after acquiring the lock; another request may have rebuilt.
+        now = time.monotonic()
+        if (
+            _questions_cache["payload"] is None
+            or _questions_cache["expires"] <= now
+            or _questions_cache["version"] != _questions_version
+        ):
+            _questions_cache["payload"] = await _build_questions_payload(service)
+            _questions_cache["expires"] = now + QUESTIONS_CACHE_TTL_SECONDS
+            _questions_cache["version"] = _questions_version
+        return Response(content=_questions_cache["payload"], media_type="application/json")
 
 @router.post("/submit")
-async def submit_assessment(submission: AssessmentSubmission):
+async def submit_assessment(
+    submission: AssessmentSubmission,
+    service: AssessmentService = Depends(get_assessment_service)
+):
     """Submit assessment responses (no authentication required)."""
-    assessment_service = AssessmentService()
     
-    # Convert string dates to datetime
-    started_at = datetime.fromisoformat(submission.started_at.replace('Z', '+00:00'))
-    completed_at = datetime.fromisoformat(submission.completed_at.replace('Z', '+00:00'))
+    # Convert string dates to datetime (ciso8601 handles the Z suffix natively)
+    started_at = ciso8601.parse_datetime(submission.started_at)
+    completed_at = ciso8601.parse_datetime(submission.completed_at)
     
-    # Add domain information back to responses for processing
-    processed_responses = []
-    for response in submission.responses:
-        # Find the original question to get domain info
-        question = assessment_service.get_question_by_id(response.question_id)
-        if question:
-            processed_response = AssessmentResponse(
-                question_id=response.question_id,
-                response=response.response,
-                domain=question["domain"],
-                question_type=question["type"]
-            )
-            processed_responses.append(processed_response)
+    # Add domain information back to responses for processing.
+    # Build the question index once instead of scanning per response.
+    questions_by_id = service.get_questions_by_ids(
+        [r.question_id for r in submission.responses]
+    )
+    # model_construct skips re-validation: question_id/response already passed
+    # AssessmentSubmission validation and domain/type come from our own data.
+    processed_responses = [
+        AssessmentResponse.model_construct(
+            question_id=response.question_id,
+            response=response.response,
+            domain=question["domain"],
+            question_type=question["type"]
+        )
+        for response in submission.responses
+        if (question := questions_by_id.get(response.question_id))
+    ]
     
     try:
-        result = await assessment_service.submit_assessment_with_user_data(
+        result = await service.submit_assessment_with_user_data(
             submission.user_data,
             processed_responses,
             started_at,
@@ -71,10 +113,12 @@ async def submit_assessment(submission: AssessmentSubmission):
         )
 
 @router.get("/results/{assessment_id}")
-async def get_assessment_result(assessment_id: str):
+async def get_assessment_result(
+    assessment_id: str,
+    service: AssessmentService = Depends(get_assessment_service)
+):
     """Get assessment result by ID (no authentication required)."""
-    assessment_service = AssessmentService()
-    result = await assessment_service.get_assessment_result(assessment_id)
+    result = await service.get_assessment_result(assessment_id)
     
     if not result:
         raise HTTPException(
@@ -86,27 +130,20 @@ async def get_assessment_result(assessment_id: str):
 
 # Admin-only endpoints (require authentication)
 @router.get("/admin/results")
-async def get_all_assessment_results(current_user: UserModel = Depends(get_current_active_user)):
+async def get_all_assessment_results(
+    current_user: UserModel = Depends(require_role("admin")),
+    service: AssessmentService = Depends(get_assessment_service)
+):
     """Get all assessment results (admin only)."""
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
-    assessment_service = AssessmentService()
-    results = await assessment_service.get_all_assessment_results()
+    results = await service.get_all_assessment_results()
     return results
 
 @router.get("/admin/results/{user_email}")
-async def get_user_assessment_results(user_email: str, current_user: UserModel = Depends(get_current_active_user)):
+async def get_user_assessment_results(
+    user_email: str,
+    current_user: UserModel = Depends(require_role("admin")),
+    service: AssessmentService = Depends(get_assessment_service)
+):
     """Get assessment results for a specific user (admin only)."""
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
-    assessment_service = AssessmentService()
-    results = await assessment_service.get_assessment_results_by_email(user_email)
+    results = await service.get_assessment_results_by_email(user_email)
     return results 
\ No newline at end of file
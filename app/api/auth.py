@@ -2,40 +2,21 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import timedelta
 from typing import Optional
-from ..core.database import get_database
 from ..models.user import UserModel, UserResponse
 from ..schemas.auth import UserCreate, AdminUserCreate, UserLogin, Token, TokenData
 from ..services.user_service import UserService
 from ..utils.auth import create_access_token, create_refresh_token, verify_token
-from .deps import get_current_user
+from .deps import get_current_user, get_user_service, invalidate_user_cache
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate):
+async def register(user_data: UserCreate, user_service: UserService = Depends(get_user_service)):
     """Register a new regular user (no authentication required)."""
-    db = get_database()
-    user_service = UserService(db.users)
-    
     try:
         user = await user_service.create_user(user_data)
-        return UserResponse(
-            id=str(user.id),
-            full_name=user.full_name,
-            username=user.username,
-            email=user.email,
-            phone=user.phone,
-            company=user.company,
-            position=user.position,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            created_at=user.created_at,
-            assessment_completed=user.assessment_completed,
-            assessment_started_at=user.assessment_started_at,
-            assessment_completed_at=user.assessment_completed_at,
-            role=user.role
-        )
+        return UserResponse.from_mongo(user.model_dump(by_alias=True))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,29 +24,11 @@ async def register(user_data: UserCreate):
         )
 
 @router.post("/admin/register", response_model=UserResponse)
-async def register_admin(user_data: AdminUserCreate):
+async def register_admin(user_data: AdminUserCreate, user_service: UserService = Depends(get_user_service)):
     """Register a new admin user (requires authentication)."""
-    db = get_database()
-    user_service = UserService(db.users)
-    
     try:
         user = await user_service.create_admin_user(user_data)
-        return UserResponse(
-            id=str(user.id),
-            full_name=user.full_name,
-            username=user.username,
-            email=user.email,
-            phone=user.phone,
-            company=user.company,
-            position=user.position,
-            is_active=user.is_active,
-            is_verified=user.is_verified,
-            created_at=user.created_at,
-            assessment_completed=user.assessment_completed,
-            assessment_started_at=user.assessment_started_at,
-            assessment_completed_at=user.assessment_completed_at,
-            role=user.role
-        )
+        return UserResponse.from_mongo(user.model_dump(by_alias=True))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -73,11 +36,8 @@ async def register_admin(user_data: AdminUserCreate):
         )
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin):
+async def login(user_credentials: UserLogin, user_service: UserService = Depends(get_user_service)):
     """Login admin user and return access token."""
-    db = get_database()
-    user_service = UserService(db.users)
-    
     user = await user_service.authenticate_user(
         user_credentials.email,
         user_credentials.password
@@ -90,8 +50,9 @@ async def login(user_credentials: UserLogin):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Update last login
+    # Update last login and drop any stale auth cache entry
     await user_service.update_last_login(str(user.id))
+    await invalidate_user_cache(str(user.id))
     
     # Create tokens
     token_data = {"sub": str(user.id), "username": user.username, "role": user.role}
@@ -135,18 +96,4 @@ async def refresh_token(refresh_token_data: dict):
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: UserModel = Depends(get_current_user)):
     """Get current admin user information."""
-    return UserResponse(
-        id=str(current_user.id),
-        full_name=current_user.full_name,
-        email=current_user.email,
-        phone=current_user.phone,
-        company=current_user.company,
-        position=current_user.position,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        created_at=current_user.created_at,
-        assessment_completed=current_user.assessment_completed,
-        assessment_started_at=current_user.assessment_started_at,
-        assessment_completed_at=current_user.assessment_completed_at,
-        role=current_user.role
-    ) 
+    return UserResponse.from_mongo(current_user.model_dump(by_alias=True)) 
@@ -1,36 +1,125 @@
-from fastapi import Depends, HTTPException, status
+from bson import ObjectId
+import orjson
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from ..core.config import settings
+from ..models.user import UserModel
 from ..utils.auth import verify_token
+from ..services.assessment_service import AssessmentService
 from ..services.user_service import UserService
-from ..core.database import get_database
+from ..core.database import get_redis
 
 security = HTTPBearer()
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Get current authenticated user."""
+def get_user_service(request: Request) -> UserService:
+    """Shared UserService put on app.state by the lifespan."""
+    return request.app.state.user_service
+
+def get_assessment_service(request: Request) -> AssessmentService:
+    """Shared AssessmentService put on app.state by the lifespan."""
+    return request.app.state.assessment_service
+
+def auth_cache_key(user_id: str) -> str:
+    return f"auth:user:{user_id}"
+
+async def _get_cached_user(redis_client, user_id: str):
+    """Load a user from the auth cache; returns None on miss or Redis error."""
+    try:
+        raw = await redis_client.get(auth_cache_key(user_id))
+    except Exception:
+        return None
+    if not raw:
+        return None
+    data = orjson.loads(raw)
+    data["_id"] = ObjectId(data["_id"])
+    return UserModel(**data)
+
+async def _cache_user(redis_client, user: UserModel):
+    """Store a user in the auth cache for the access-token lifetime."""
+    try:
+        await redis_client.setex(
+            auth_cache_key(str(user.id)),
+            settings.access_token_expire_minutes * 60,
+            user.model_dump_json(by_alias=True)
+        )
+    except Exception:
+        pass
+
+async def invalidate_user_cache(user_id: str):
+    """Drop a user's auth cache entry (call after any user mutation)."""
+    redis_client = get_redis()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(auth_cache_key(user_id))
+    except Exception:
+        pass
+
+async def _resolve_current_user(
+    credentials: HTTPAuthorizationCredentials, user_service: UserService
+) -> UserModel:
+    """Token verify -> cache/DB lookup, shared by all auth dependencies."""
     token = credentials.credentials
     payload = verify_token(token)
-    
+
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    db = get_database()
-    user_service = UserService(db.users)
-    user = await user_service.get_user_by_id(payload.get("sub"))
-    
+
+    user_id = payload.get("sub")
+    redis_client = get_redis()
+    user = None
+    if redis_client is not None:
+        user = await _get_cached_user(redis_client, user_id)
+
+    if user is None:
+        user = await user_service.get_user_by_id(user_id)
+        if user is not None and redis_client is not None:
+            await _cache_user(redis_client, user)
+
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
     return user
 
+def require_role(role: str = None):
+    """Build a single dependency doing verify, lookup, active and role checks.
+
+    Collapses the get_current_user -> active -> role dependency chain into
+    one coroutine so FastAPI resolves one dependency instead of three.
+    """
+    async def dependency(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        user_service: UserService = Depends(get_user_service)
+    ) -> UserModel:
+        user = await _resolve_current_user(credentials, user_service)
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Inactive user"
+            )
+        if role is not None and user.role != role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"{role.capitalize()} access required"
+            )
+        return user
+    return dependency
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Get current authenticated user."""
+    return await _resolve_current_user(credentials, user_service)
+
 async def get_current_active_user(current_user = Depends(get_current_user)):
     """Get current active user."""
     if not current_user.is_active:
@@ -38,9 +127,6 @@ async def get_current_active_user(current_user = Depends(get_current_user)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-    return current_user 
+    return current_user
 
-async def get_current_admin_user(current_user = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
-    return current_user 
\ No newline at end of file
+get_current_admin_user = require_role("admin") 
\ No newline at end of file
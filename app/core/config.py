@@ -9,6 +9,11 @@ class Settings(BaseSettings):
     # Database Configuration
     mongodb_url: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     database_name: str = os.getenv("DATABASE_NAME", "kaliedo_synergy")
+    mongo_max_pool_size: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+    mongo_min_pool_size: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+    mongo_max_idle_ms: int = int(os.getenv("MONGO_MAX_IDLE_MS", "60000"))
+    # Optional wire compression, e.g. "zstd,snappy" (needs the matching packages)
+    mongo_compressors: str = os.getenv("MONGO_COMPRESSORS", "")
     
     # JWT Configuration
     jwt_secret_key: str = os.getenv("JWT_SECRET_KEY", "your-super-secret-jwt-key-here-change-in-production")
@@ -16,6 +21,9 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     refresh_token_expire_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
     
+    # Redis Configuration (optional, used for the auth cache)
+    redis_url: str = os.getenv("REDIS_URL", "")
+
     # Application Configuration
     app_name: str = os.getenv("APP_NAME", "Kaleido Synergy Assessment Centre")
     debug: bool = os.getenv("DEBUG", "True").lower() == "true"
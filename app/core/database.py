@@ -1,24 +1,91 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from dataclasses import dataclass
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+import redis.asyncio as redis
 from .config import settings
 
+@dataclass
+class Collections:
+    """Collection handles resolved once at startup instead of per request."""
+    users: AsyncCollection
+    questions: AsyncCollection
+    assessment_results: AsyncCollection
+
 class Database:
-    client: AsyncIOMotorClient = None
+    client: AsyncMongoClient = None
     database = None
+    collections: Collections = None
+    redis = None
 
 db = Database()
 
 async def connect_to_mongo():
     """Create database connection."""
-    db.client = AsyncIOMotorClient(settings.mongodb_url)
+    client_kwargs = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "maxIdleTimeMS": settings.mongo_max_idle_ms,
+    }
+    if settings.mongo_compressors:
+        client_kwargs["compressors"] = settings.mongo_compressors
+    db.client = AsyncMongoClient(settings.mongodb_url, **client_kwargs)
     db.database = db.client[settings.database_name]
+    db.collections = Collections(
+        users=db.database.users,
+        questions=db.database.questions,
+        assessment_results=db.database.assessment_results
+    )
+    await ensure_indexes()
     print("Connected to MongoDB.")
 
+async def ensure_indexes():
+    """Create the indexes backing the hot queries."""
+    index_specs = [
+        ("assessment_results", [("user_id", 1), ("created_at", -1)], {}),
+        ("assessment_results", [("user_data.email", 1), ("created_at", -1)], {}),
+        ("assessment_results", [("created_at", -1)], {}),
+        ("assessment_results", [("responses.domain", 1)], {}),
+        ("users", [("created_at", -1), ("_id", -1)], {}),
+        ("users", [("email", 1)], {"unique": True}),
+        ("users", [("username", 1), ("role", 1)],
+         {"unique": True, "partialFilterExpression": {"role": "admin"}}),
+        ("questions", [("is_active", 1), ("question_number", 1)], {}),
+    ]
+    for collection_name, keys, options in index_specs:
+        try:
+            await db.database[collection_name].create_index(keys, **options)
+        except Exception as e:
+            # Index creation must not keep the app from starting (e.g. a
+            # unique index colliding with legacy duplicate data).
+            print(f"Index creation failed for {collection_name} {keys}: {e}")
+
 async def close_mongo_connection():
     """Close database connection."""
     if db.client:
-        db.client.close()
+        await db.client.close()
         print("Disconnected from MongoDB.")
 
+async def connect_to_redis():
+    """Create Redis connection if configured."""
+    if settings.redis_url:
+        db.redis = redis.from_url(settings.redis_url, decode_responses=True)
+        print("Connected to Redis.")
+
+async def close_redis_connection():
+    """Close Redis connection."""
+    if db.redis:
+        await db.redis.aclose()
+        db.redis = None
+        print("Disconnected from Redis.")
+
 def get_database():
     """Get database instance."""
-    return db.database 
\ No newline at end of file
+    return db.database
+
+def get_collections() -> Collections:
+    """Get the cached collection handles."""
+    return db.collections
+
+def get_redis():
+    """Get Redis client, or None when the auth cache is disabled."""
+    return db.redis
@@ -0,0 +1,18 @@
+import asyncio
+from passlib.context import CryptContext
+
+# Single CryptContext shared by every password code path so the scheme and
+# deprecation policy are configured in exactly one place.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash.
+
+    bcrypt is compute-bound, so the check runs in a worker thread instead of
+    blocking the event loop for the duration of the KDF.
+    """
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    """Generate a password hash in a worker thread."""
+    return await asyncio.to_thread(pwd_context.hash, password)
@@ -1,15 +1,13 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, ConfigDict
-from bson import ObjectId
 from .user import PyObjectId
 from ..models.user import UserResponse
 
 class QuestionModel(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
+        arbitrary_types_allowed=True
     )
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -36,8 +34,7 @@ class AssessmentSubmission(BaseModel):
 class AssessmentResult(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
-        arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str}
+        arbitrary_types_allowed=True
     )
     
     id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
@@ -53,8 +50,6 @@ class AssessmentResult(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class AssessmentResultResponse(BaseModel):
-    model_config = ConfigDict(json_encoders={ObjectId: str})
-    
     id: str
     user_data: Dict[str, Any]
     domain_scores: Dict[str, int]
@@ -65,4 +60,9 @@ class AssessmentResultResponse(BaseModel):
     started_at: datetime
     completed_at: datetime
     total_time_minutes: int
-    created_at: datetime 
\ No newline at end of file
+    created_at: datetime
+
+    @classmethod
+    def from_mongo(cls, data: Dict[str, Any]) -> "AssessmentResultResponse":
+        """Build a response from a Mongo document or a pre-projected dict."""
+        return cls.model_validate({**data, "id": str(data.get("_id", data.get("id", "")))}) 
\ No newline at end of file
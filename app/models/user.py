@@ -1,24 +1,44 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Annotated
 from pydantic import BaseModel, Field, ConfigDict
+from pydantic_core import core_schema
 from bson import ObjectId
+from bson.errors import InvalidId
 
 class PyObjectId(ObjectId):
+    @classmethod
+    def _validate(cls, value) -> ObjectId:
+        try:
+            return ObjectId(value)
+        except (InvalidId, TypeError) as e:
+            # pydantic only turns ValueError/AssertionError into validation
+            # errors; anything else would escape as a 500.
+            raise ValueError(str(e))
+
     @classmethod
     def __get_pydantic_core_schema__(cls, source_type, handler):
-        return handler(ObjectId)
+        # Tell pydantic-core exactly how to handle ObjectId: pass instances
+        # through, coerce strings, and serialize as str. This avoids the slow
+        # arbitrary-type fallback and the per-model json_encoders config.
+        return core_schema.json_or_python_schema(
+            json_schema=core_schema.no_info_plain_validator_function(cls._validate),
+            python_schema=core_schema.union_schema([
+                core_schema.is_instance_schema(ObjectId),
+                core_schema.no_info_plain_validator_function(cls._validate),
+            ]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                str, when_used="json"
+            ),
+        )
 
     @classmethod
-    def __get_pydantic_json_schema__(cls, core_schema, handler):
-        json_schema = handler(core_schema)
-        json_schema.update(type="string")
-        return json_schema
+    def __get_pydantic_json_schema__(cls, core_schema_, handler):
+        return {"type": "string"}
 
 class UserModel(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
         arbitrary_types_allowed=True,
-        json_encoders={ObjectId: str},
         json_schema_extra={
             "example": {
                 "full_name": "John Doe",
@@ -52,8 +72,6 @@ class UserModel(BaseModel):
     role: str = Field(default="user", description="Role of the user: user or admin")
 
 class UserResponse(BaseModel):
-    model_config = ConfigDict(json_encoders={ObjectId: str})
-    
     id: str
     full_name: str
     email: str
@@ -66,4 +84,9 @@ class UserResponse(BaseModel):
     assessment_completed: bool
     assessment_started_at: Optional[datetime] = None
     assessment_completed_at: Optional[datetime] = None
-    role: str = "user" 
\ No newline at end of file
+    role: str = "user"
+
+    @classmethod
+    def from_mongo(cls, data: Dict[str, Any]) -> "UserResponse":
+        """Build a response from a Mongo document or a pre-projected dict."""
+        return cls.model_validate({**data, "id": str(data.get("_id", data.get("id", "")))}) 
\ No newline at end of file
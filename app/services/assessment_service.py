@@ -1,158 +1,151 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import cached_property
 from typing import List, Dict, Optional
 from bson import ObjectId
-from ..core.database import get_database
+from pymongo import WriteConcern
+from ..core.database import get_collections
 from ..models.assessment import AssessmentResult, AssessmentResultResponse, AssessmentResponse
 from ..utils.assessment import (
-    get_shuffled_questions, 
-    calculate_domain_scores, 
-    calculate_descriptive_scores,
-    calculate_total_score, 
-    get_overall_rating, 
-    get_domain_ratings,
-    validate_responses
+    get_shuffled_questions,
+    get_question_by_id as lookup_question_by_id,
+    process_responses
 )
-from ..services.user_service import UserService
+from ..services.user_service import UserService, get_user_service
 from fastapi import HTTPException, status
 
+# Fields AssessmentResultResponse needs; passed as a projection so Mongo
+# skips decoding the bulky responses array on read paths.
+_RESULT_PROJECTION = {
+    "user_data": 1,
+    "domain_scores": 1,
+    "descriptive_scores": 1,
+    "total_score": 1,
+    "overall_rating": 1,
+    "domain_ratings": 1,
+    "started_at": 1,
+    "completed_at": 1,
+    "total_time_minutes": 1,
+    "created_at": 1,
+}
+
 class AssessmentService:
-    def __init__(self):
-        self.db = get_database()
-        self.results_collection = self.db.assessment_results
-        self.user_service = UserService(self.db.users)
+    # Collection handles resolve lazily so the module-level singleton can be
+    # created before the database connection exists.
+    @cached_property
+    def results_collection(self):
+        # w=1, j=False: the submit insert is acknowledged by the primary but
+        # does not wait for the journal fsync. Trade-off: a result written in
+        # the instant before a server crash can be lost; acceptable here in
+        # exchange for not paying a journal-sync wait on every submission.
+        return get_collections().assessment_results.with_options(
+            write_concern=WriteConcern(w=1, j=False)
+        )
+
+    @cached_property
+    def user_service(self) -> UserService:
+        return get_user_service()
 
     async def get_questions(self) -> List[Dict]:
         """Get shuffled assessment questions."""
         return get_shuffled_questions()
 
     def get_question_by_id(self, question_id: str) -> Optional[Dict]:
-        """Get question by ID from the shuffled questions."""
-        questions = get_shuffled_questions()
-        for q in questions:
-            if q["id"] == question_id:
-                return q
-        return None
+        """Get question by ID from the precomputed index."""
+        return lookup_question_by_id(question_id)
+
+    def get_questions_by_ids(self, question_ids: List[str]) -> Dict[str, Dict]:
+        """Get a question_id -> question mapping for a batch of IDs."""
+        return {
+            qid: question
+            for qid in question_ids
+            if (question := lookup_question_by_id(qid))
+        }
 
     async def submit_assessment_with_user_data(self, user_data: Dict, responses: List[AssessmentResponse], 
                                               started_at: datetime, completed_at: datetime) -> AssessmentResultResponse:
         """Submit assessment responses with user data and calculate results."""
-        # Validate responses
-        if not validate_responses(responses):
+        # Validate, score, and serialize in one pass over the responses
+        scores, serialized_responses = process_responses(responses)
+        if scores is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid assessment responses"
             )
-        
-        # Calculate scores
-        domain_scores = calculate_domain_scores(responses)
-        descriptive_scores = calculate_descriptive_scores(responses)
-        total_score = calculate_total_score(domain_scores)
-        overall_rating = get_overall_rating(domain_scores)
-        domain_ratings = get_domain_ratings(domain_scores)
-        
+
         # Calculate time taken
         time_diff = completed_at - started_at
         total_time_minutes = int(time_diff.total_seconds() / 60)
-        
+
         # Create assessment result
         result_data = {
             "user_data": user_data,
-            "responses": [response.dict() for response in responses],
-            "domain_scores": domain_scores,
-            "descriptive_scores": descriptive_scores,
-            "total_score": total_score,
-            "overall_rating": overall_rating,
+            "responses": serialized_responses,
+            "domain_scores": scores.domain_scores,
+            "descriptive_scores": scores.descriptive_scores,
+            "total_score": scores.total_score,
+            "overall_rating": scores.overall_rating,
+            "domain_ratings": scores.domain_ratings,
             "started_at": started_at,
             "completed_at": completed_at,
             "total_time_minutes": total_time_minutes,
-            "created_at": datetime.utcnow()
+            "created_at": datetime.now(timezone.utc)
         }
-        
+
         # Save to database
         result = await self.results_collection.insert_one(result_data)
         result_data["_id"] = result.inserted_id
-        
-        # Create response
-        return AssessmentResultResponse(
-            id=str(result.inserted_id),
-            user_data=user_data,
-            domain_scores=domain_scores,
-            descriptive_scores=descriptive_scores,
-            total_score=total_score,
-            overall_rating=overall_rating,
-            domain_ratings=domain_ratings,
-            started_at=started_at,
-            completed_at=completed_at,
-            total_time_minutes=total_time_minutes,
-            created_at=result_data["created_at"]
+
+        # Create response from the document just written
+        return self._row_to_response(result_data)
+
+    @staticmethod
+    def _row_to_response(result: Dict) -> AssessmentResultResponse:
+        """Build a response from a stored result doc without re-validation.
+
+        model_construct skips the validator pipeline; the data was validated
+        when the result was written.
+        """
+        return AssessmentResultResponse.model_construct(
+            id=str(result["_id"]),
+            user_data=result["user_data"],
+            domain_scores=result["domain_scores"],
+            descriptive_scores=result.get("descriptive_scores", {}),
+            total_score=result["total_score"],
+            overall_rating=result["overall_rating"],
+            domain_ratings=result.get("domain_ratings", {}),
+            started_at=result["started_at"],
+            completed_at=result["completed_at"],
+            total_time_minutes=result["total_time_minutes"],
+            created_at=result["created_at"]
         )
 
     async def get_assessment_result(self, assessment_id: str) -> Optional[AssessmentResultResponse]:
         """Get assessment result by ID."""
         try:
-            result = await self.results_collection.find_one({"_id": ObjectId(assessment_id)})
+            result = await self.results_collection.find_one(
+                {"_id": ObjectId(assessment_id)}, _RESULT_PROJECTION
+            )
             if not result:
                 return None
-            
-            return AssessmentResultResponse(
-                id=str(result["_id"]),
-                user_data=result["user_data"],
-                domain_scores=result["domain_scores"],
-                descriptive_scores=result.get("descriptive_scores", {}),
-                total_score=result["total_score"],
-                overall_rating=result["overall_rating"],
-                domain_ratings=result.get("domain_ratings", {}),
-                started_at=result["started_at"],
-                completed_at=result["completed_at"],
-                total_time_minutes=result["total_time_minutes"],
-                created_at=result["created_at"]
-            )
+            return self._row_to_response(result)
         except:
             return None
 
     async def get_all_assessment_results(self) -> List[AssessmentResultResponse]:
         """Get all assessment results (admin only)."""
-        cursor = self.results_collection.find().sort("created_at", -1)
-        results = await cursor.to_list(length=None)
-        
-        return [
-            AssessmentResultResponse(
-                id=str(result["_id"]),
-                user_data=result["user_data"],
-                domain_scores=result["domain_scores"],
-                descriptive_scores=result.get("descriptive_scores", {}),
-                total_score=result["total_score"],
-                overall_rating=result["overall_rating"],
-                domain_ratings=result.get("domain_ratings", {}),
-                started_at=result["started_at"],
-                completed_at=result["completed_at"],
-                total_time_minutes=result["total_time_minutes"],
-                created_at=result["created_at"]
-            )
-            for result in results
-        ]
+        # Stream in batches instead of materializing every raw doc at once;
+        # only the (much smaller) response objects are held together.
+        cursor = self.results_collection.find(
+            {}, _RESULT_PROJECTION
+        ).sort("created_at", -1).batch_size(500)
+        return [self._row_to_response(result) async for result in cursor]
 
     async def get_assessment_results_by_email(self, email: str) -> List[AssessmentResultResponse]:
         """Get assessment results for a specific user by email."""
-        cursor = self.results_collection.find({"user_data.email": email}).sort("created_at", -1)
-        results = await cursor.to_list(length=None)
-        
-        return [
-            AssessmentResultResponse(
-                id=str(result["_id"]),
-                user_data=result["user_data"],
-                domain_scores=result["domain_scores"],
-                descriptive_scores=result.get("descriptive_scores", {}),
-                total_score=result["total_score"],
-                overall_rating=result["overall_rating"],
-                domain_ratings=result.get("domain_ratings", {}),
-                started_at=result["started_at"],
-                completed_at=result["completed_at"],
-                total_time_minutes=result["total_time_minutes"],
-                created_at=result["created_at"]
-            )
-            for result in results
-        ]
+        cursor = self.results_collection.find(
+            {"user_data.email": email}, _RESULT_PROJECTION
+        ).sort("created_at", -1).batch_size(500)
+        return [self._row_to_response(result) async for result in cursor]
 
     async def get_overall_statistics(self) -> Dict:
         """Get overall assessment statistics."""
@@ -165,7 +158,8 @@ class AssessmentService:
             }}
         ]
         
-        stats = await self.results_collection.aggregate(pipeline).to_list(length=1)
+        cursor = await self.results_collection.aggregate(pipeline)
+        stats = await cursor.to_list(length=1)
         
         if not stats:
             return {
@@ -178,32 +172,43 @@ class AssessmentService:
 
     async def get_domain_analysis(self, domain: str) -> Dict:
         """Get analysis for a specific domain."""
+        # Both analyses run as sub-pipelines of one $facet, so the collection
+        # is read in a single aggregation round trip instead of two.
         pipeline = [
-            {"$unwind": "$responses"},
-            {"$match": {"responses.domain": domain}},
-            {"$group": {
-                "_id": "$responses.response",
-                "count": {"$sum": 1},
-                "total_responses": {"$sum": 1}
-            }},
-            {"$sort": {"_id": 1}}
-        ]
-        
-        cursor = self.results_collection.aggregate(pipeline)
-        domain_stats = await cursor.to_list(length=None)
-        
-        # Calculate domain averages
-        domain_averages = await self.results_collection.aggregate([
-            {"$group": {
-                "_id": None,
-                "avg_score": {"$avg": f"$domain_scores.{domain}"},
-                "total_assessments": {"$sum": 1}
+            {"$facet": {
+                "distribution": [
+                    # Filter and strip to the responses array before the
+                    # expensive $unwind; re-match after to drop other
+                    # domains' entries within the surviving documents.
+                    {"$match": {"responses.domain": domain}},
+                    {"$project": {"responses": 1}},
+                    {"$unwind": "$responses"},
+                    {"$match": {"responses.domain": domain}},
+                    {"$group": {
+                        "_id": "$responses.response",
+                        "count": {"$sum": 1},
+                        "total_responses": {"$sum": 1}
+                    }},
+                    {"$sort": {"_id": 1}}
+                ],
+                "averages": [
+                    {"$group": {
+                        "_id": None,
+                        "avg_score": {"$avg": f"$domain_scores.{domain}"},
+                        "total_assessments": {"$sum": 1}
+                    }}
+                ]
             }}
-        ]).to_list(length=1)
-        
+        ]
+
+        cursor = await self.results_collection.aggregate(pipeline)
+        facets = await cursor.to_list(length=1)
+        domain_stats = facets[0]["distribution"] if facets else []
+        domain_averages = facets[0]["averages"] if facets else []
+
         return {
             "domain": domain,
             "response_distribution": domain_stats,
             "average_score": domain_averages[0]["avg_score"] if domain_averages else 0,
             "total_assessments": domain_averages[0]["total_assessments"] if domain_averages else 0
-        } 
\ No newline at end of file
+        }
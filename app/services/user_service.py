@@ -1,62 +1,74 @@
-from datetime import datetime
+import hashlib
+import time
+from datetime import datetime, timezone
 from typing import Optional, List
 from bson import ObjectId
-from passlib.context import CryptContext
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from ..core.database import get_collections
+from ..core.security import verify_password, get_password_hash
 from ..models.user import UserModel, UserResponse
 from ..schemas.auth import UserCreate, AdminUserCreate, UserUpdate
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Only the fields UserResponse exposes; _id comes back by default and is
+# mapped onto the model's id.
+_USER_RESPONSE_FIELDS = {f: 1 for f in UserResponse.model_fields if f != "id"}
+
+# Short-lived cache of successful verifications so rapid re-logins with the
+# same credentials skip the ~100ms bcrypt KDF. Keys hold a password digest,
+# never the password itself, and entries are tied to the stored hash.
+_VERIFY_CACHE_TTL_SECONDS = 60.0
+_VERIFY_CACHE_MAX_ENTRIES = 1024
+_verify_cache = {}  # (email, password_digest) -> (hashed_password, expires)
 
 class UserService:
     def __init__(self, collection):
         self.collection = collection
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
-
-    def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    @staticmethod
+    def _raise_duplicate(error: DuplicateKeyError):
+        """Translate a unique-index violation into the matching ValueError."""
+        key_pattern = (error.details or {}).get("keyPattern", {})
+        if "username" in key_pattern:
+            raise ValueError("Username already taken")
+        raise ValueError("Email already registered")
 
     async def create_user(self, user_data: UserCreate) -> UserModel:
         """Create a new regular user (no authentication required)."""
-        # Check if email already exists
-        existing_user = await self.collection.find_one({"email": user_data.email})
-        if existing_user:
-            raise ValueError("Email already registered")
-
-        # Create new user without authentication
-        hashed_password = self.get_password_hash(user_data.password)
+        # Create new user without authentication; duplicates are rejected by
+        # the unique email index instead of a separate lookup round trip.
+        hashed_password = await get_password_hash(user_data.password)
+        now = datetime.now(timezone.utc)
         user_dict = user_data.dict()
         user_dict["hashed_password"] = hashed_password
-        user_dict["created_at"] = datetime.utcnow()
-        user_dict["updated_at"] = datetime.utcnow()
+        user_dict["created_at"] = now
+        user_dict["updated_at"] = now
         user_dict["role"] = "user"
-        
-        result = await self.collection.insert_one(user_dict)
+
+        try:
+            result = await self.collection.insert_one(user_dict)
+        except DuplicateKeyError as e:
+            self._raise_duplicate(e)
         user_dict["id"] = result.inserted_id
         return UserModel(**user_dict)
 
     async def create_admin_user(self, user_data: AdminUserCreate) -> UserModel:
         """Create a new admin user with authentication."""
-        # Check if username already exists
-        existing_user = await self.collection.find_one({"username": user_data.username})
-        if existing_user:
-            raise ValueError("Username already taken")
-
-        # Check if email already exists
-        existing_email = await self.collection.find_one({"email": user_data.email})
-        if existing_email:
-            raise ValueError("Email already registered")
-
-        # Create new admin user
-        hashed_password = self.get_password_hash(user_data.password)
+        # Create new admin user; the unique email and admin-username indexes
+        # replace the two pre-insert existence checks and stay correct under
+        # concurrent signups.
+        hashed_password = await get_password_hash(user_data.password)
+        now = datetime.now(timezone.utc)
         user_dict = user_data.dict()
         user_dict["hashed_password"] = hashed_password
-        user_dict["created_at"] = datetime.utcnow()
-        user_dict["updated_at"] = datetime.utcnow()
+        user_dict["created_at"] = now
+        user_dict["updated_at"] = now
         user_dict["role"] = "admin"
-        
-        result = await self.collection.insert_one(user_dict)
+
+        try:
+            result = await self.collection.insert_one(user_dict)
+        except DuplicateKeyError as e:
+            self._raise_duplicate(e)
         user_dict["id"] = result.inserted_id
         return UserModel(**user_dict)
 
@@ -65,8 +77,20 @@ class UserService:
         user = await self.collection.find_one({"email": email})
         if not user:
             return None
-        if not self.verify_password(password, user["hashed_password"]):
+
+        cache_key = (email, hashlib.sha256(password.encode()).hexdigest())
+        now = time.monotonic()
+        cached = _verify_cache.get(cache_key)
+        if cached and cached[0] == user["hashed_password"] and cached[1] > now:
+            return UserModel(**user)
+
+        # bcrypt is compute-bound; verify_password runs it off the event loop.
+        if not await verify_password(password, user["hashed_password"]):
             return None
+
+        if len(_verify_cache) >= _VERIFY_CACHE_MAX_ENTRIES:
+            _verify_cache.clear()
+        _verify_cache[cache_key] = (user["hashed_password"], now + _VERIFY_CACHE_TTL_SECONDS)
         return UserModel(**user)
 
     async def get_user_by_id(self, user_id: str) -> Optional[UserModel]:
@@ -90,29 +114,28 @@ class UserService:
     async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[UserModel]:
         """Update user information."""
         update_data = user_data.dict(exclude_unset=True)
-        update_data["updated_at"] = datetime.utcnow()
-        
-        result = await self.collection.update_one(
+        update_data["updated_at"] = datetime.now(timezone.utc)
+
+        # Update and read back atomically in one round trip.
+        user = await self.collection.find_one_and_update(
             {"_id": ObjectId(user_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
         )
-        
-        if result.modified_count:
-            return await self.get_user_by_id(user_id)
-        return None
+        return UserModel(**user) if user else None
 
     async def update_last_login(self, user_id: str):
         """Update user's last login time."""
         await self.collection.update_one(
             {"_id": ObjectId(user_id)},
-            {"$set": {"last_login": datetime.utcnow()}}
+            {"$set": {"last_login": datetime.now(timezone.utc)}}
         )
 
     async def mark_assessment_started(self, user_id: str):
         """Mark assessment as started for user."""
         await self.collection.update_one(
             {"_id": ObjectId(user_id)},
-            {"$set": {"assessment_started_at": datetime.utcnow()}}
+            {"$set": {"assessment_started_at": datetime.now(timezone.utc)}}
         )
 
     async def mark_assessment_completed(self, user_id: str):
@@ -121,35 +144,59 @@ class UserService:
             {"_id": ObjectId(user_id)},
             {"$set": {
                 "assessment_completed": True,
-                "assessment_completed_at": datetime.utcnow()
+                "assessment_completed_at": datetime.now(timezone.utc)
             }}
         )
 
     async def update_assessment_status(self, user_id: str, completed: bool = False):
         """Update user's assessment status."""
+        now = datetime.now(timezone.utc)
         update_data = {
             "assessment_completed": completed,
-            "updated_at": datetime.utcnow()
+            "updated_at": now
         }
-        
+
         if completed:
-            update_data["assessment_completed_at"] = datetime.utcnow()
+            update_data["assessment_completed_at"] = now
         else:
-            update_data["assessment_started_at"] = datetime.utcnow()
+            update_data["assessment_started_at"] = now
         
         await self.collection.update_one(
             {"_id": ObjectId(user_id)},
             {"$set": update_data}
         )
 
+    @staticmethod
+    async def _list_users(cursor) -> List[UserResponse]:
+        """Stream a projected user cursor into response models.
+
+        model_construct skips the validator pipeline; the documents were
+        validated on write and the projection limits them to model fields.
+        """
+        return [
+            UserResponse.model_construct(id=str(user.pop("_id")), **user)
+            async for user in cursor.batch_size(500)
+        ]
+
     async def get_all_users(self) -> List[UserResponse]:
         """Get all users (admin only)."""
-        cursor = self.collection.find({})
-        users = await cursor.to_list(length=None)
-        return [UserResponse(**user) for user in users]
+        return await self._list_users(self.collection.find({}, _USER_RESPONSE_FIELDS))
 
     async def get_users_by_role(self, role: str) -> List[UserResponse]:
         """Get users by role."""
-        cursor = self.collection.find({"role": role})
-        users = await cursor.to_list(length=None)
-        return [UserResponse(**user) for user in users] 
\ No newline at end of file
+        return await self._list_users(
+            self.collection.find({"role": role}, _USER_RESPONSE_FIELDS)
+        )
+
+_user_service: Optional[UserService] = None
+
+def get_user_service() -> UserService:
+    """Get the shared UserService bound to the users collection.
+
+    Created lazily on first use so module import does not require a live
+    database connection.
+    """
+    global _user_service
+    if _user_service is None:
+        _user_service = UserService(get_collections().users)
+    return _user_service 
\ No newline at end of file
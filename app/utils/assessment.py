@@ -1,4 +1,7 @@
-from typing import Dict, List, Tuple
+from bisect import bisect_right
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 import random
 from ..models.assessment import AssessmentResponse, QuestionModel
 
@@ -106,11 +109,11 @@ DESCRIPTIVE_QUESTIONS = [
     }
 ]
 
-def get_shuffled_questions() -> List[Dict]:
-    """Get all assessment questions in shuffled order without domain tags for users."""
+def _build_question_template() -> Tuple[Dict, ...]:
+    """Build the immutable question list once; shuffling copies it per call."""
     all_questions = []
     question_id = 1
-    
+
     for domain, questions in ASSESSMENT_QUESTIONS.items():
         for i, question in enumerate(questions, 1):
             all_questions.append({
@@ -121,7 +124,7 @@ def get_shuffled_questions() -> List[Dict]:
                 "type": "mcq"
             })
             question_id += 1
-    
+
     # Add descriptive questions
     for desc_q in DESCRIPTIVE_QUESTIONS:
         all_questions.append({
@@ -131,31 +134,101 @@ def get_shuffled_questions() -> List[Dict]:
             "domain_question_number": 0,  # Not part of regular domain scoring
             "type": "descriptive"
         })
-    
+
+    return tuple(all_questions)
+
+_QUESTION_TEMPLATE = _build_question_template()
+# id -> question lookup; valid regardless of shuffling since ids are stable.
+_QUESTION_BY_ID = {q["id"]: q for q in _QUESTION_TEMPLATE}
+
+def get_question_by_id(question_id: str) -> Optional[Dict]:
+    """Look up a question by ID in O(1); ids are stable across shuffles."""
+    return _QUESTION_BY_ID.get(question_id)
+
+def get_shuffled_questions() -> List[Dict]:
+    """Get all assessment questions in shuffled order without domain tags for users."""
+    # Copy the precomputed template instead of rebuilding each dict
+    all_questions = [dict(q) for q in _QUESTION_TEMPLATE]
+
     # Shuffle questions to prevent pattern recognition
     random.shuffle(all_questions)
-    
+
     # Add sequential question numbers after shuffling
     for i, question in enumerate(all_questions, 1):
         question["question_number"] = i
-    
+
     return all_questions
 
+_DESC_IDS = frozenset({"desc_1", "desc_2"})
+_EXPECTED_DOMAINS = frozenset(ASSESSMENT_QUESTIONS.keys())
+# Zeroed score template copied per call instead of rebuilding the dict
+# literal; read-only so a stray mutation can't poison later calls.
+_ZERO_DOMAIN_SCORES = MappingProxyType({domain: 0 for domain in ASSESSMENT_QUESTIONS})
+
+@dataclass(slots=True)
+class AssessmentScores:
+    """Every score derived from one submission, built in a single allocation.
+
+    slots avoids the per-instance __dict__ and makes attribute access a
+    fixed-offset load on the submit hot path.
+    """
+    domain_scores: Dict[str, int]
+    descriptive_scores: Dict[str, int]
+    domain_ratings: Dict[str, str]
+    total_score: int
+    overall_rating: str
+
+def process_responses(responses: List[AssessmentResponse]) -> Tuple[Optional[AssessmentScores], List[Dict]]:
+    """Validate, score, and serialize all responses in a single pass.
+
+    Fuses validate_responses, calculate_domain_scores,
+    calculate_descriptive_scores, and the per-response model_dump so the
+    72-item response list is walked once instead of five times. Returns
+    (scores, serialized); scores is None when the submission is invalid.
+    """
+    domain_scores = dict(_ZERO_DOMAIN_SCORES)
+    descriptive_scores = {}
+    serialized = []
+    domains_covered = set()
+    mcq_count = 0
+
+    for response in responses:
+        value = response.response
+        if response.question_id in _DESC_IDS:
+            if not (0 <= value <= 3):
+                return None, serialized
+            descriptive_scores[response.question_id] = value
+        else:
+            if not (1 <= value <= 5) or response.domain not in domain_scores:
+                return None, serialized
+            domain_scores[response.domain] += value
+            domains_covered.add(response.domain)
+            mcq_count += 1
+        serialized.append(response.model_dump())
+
+    valid = (
+        mcq_count == 70
+        and len(descriptive_scores) == 2
+        and len(domains_covered) == len(domain_scores)
+    )
+    if not valid:
+        return None, serialized
+
+    return AssessmentScores(
+        domain_scores=domain_scores,
+        descriptive_scores=descriptive_scores,
+        domain_ratings=get_domain_ratings(domain_scores),
+        total_score=calculate_total_score(domain_scores),
+        overall_rating=get_overall_rating(domain_scores),
+    ), serialized
+
 def calculate_domain_scores(responses: List[AssessmentResponse]) -> Dict[str, int]:
     """Calculate scores for each domain based on responses (excluding descriptive questions)."""
-    domain_scores = {
-        "leadership": 0,
-        "accountability": 0,
-        "communication": 0,
-        "innovation": 0,
-        "sales": 0,
-        "ethics": 0,
-        "collaboration": 0
-    }
-    
+    domain_scores = dict(_ZERO_DOMAIN_SCORES)
+
     for response in responses:
         # Only count MCQ responses for domain scoring
-        if response.domain in domain_scores and response.question_id not in ["desc_1", "desc_2"]:
+        if response.domain in domain_scores and response.question_id not in _DESC_IDS:
             domain_scores[response.domain] += response.response
     
     return domain_scores
@@ -165,7 +238,7 @@ def calculate_descriptive_scores(responses: List[AssessmentResponse]) -> Dict[st
     descriptive_scores = {}
     
     for response in responses:
-        if response.question_id in ["desc_1", "desc_2"]:
+        if response.question_id in _DESC_IDS:
             descriptive_scores[response.question_id] = response.response
     
     return descriptive_scores
@@ -174,18 +247,14 @@ def calculate_total_score(domain_scores: Dict[str, int]) -> int:
     """Calculate total score from domain scores."""
     return sum(domain_scores.values())
 
+# Rating bands: scores below 20 are critical, then each threshold starts the
+# next label (>=20 weakness, >=28 developing, >=36 strength, >=44 exemplary).
+_RATING_THRESHOLDS = (20, 28, 36, 44)
+_RATING_LABELS = ("critical", "weakness", "developing", "strength", "exemplary")
+
 def get_rating_for_score(score: int) -> str:
     """Get rating based on score."""
-    if score >= 44:
-        return "exemplary"
-    elif score >= 36:
-        return "strength"
-    elif score >= 28:
-        return "developing"
-    elif score >= 20:
-        return "weakness"
-    else:
-        return "critical"
+    return _RATING_LABELS[bisect_right(_RATING_THRESHOLDS, score)]
 
 def get_overall_rating(domain_scores: Dict[str, int]) -> str:
     """Get overall rating based on average domain scores."""
@@ -206,8 +275,8 @@ def validate_responses(responses: List[AssessmentResponse]) -> bool:
     expected_mcq_questions = 70  # 10 questions per domain * 7 domains
     expected_descriptive_questions = 2
     
-    mcq_responses = [r for r in responses if r.question_id not in ["desc_1", "desc_2"]]
-    descriptive_responses = [r for r in responses if r.question_id in ["desc_1", "desc_2"]]
+    mcq_responses = [r for r in responses if r.question_id not in _DESC_IDS]
+    descriptive_responses = [r for r in responses if r.question_id in _DESC_IDS]
     
     if len(mcq_responses) != expected_mcq_questions:
         return False
@@ -217,9 +286,8 @@ def validate_responses(responses: List[AssessmentResponse]) -> bool:
     
     # Check that all domains are covered in MCQ responses
     domains_covered = set(response.domain for response in mcq_responses)
-    expected_domains = set(ASSESSMENT_QUESTIONS.keys())
-    
-    if domains_covered != expected_domains:
+
+    if domains_covered != _EXPECTED_DOMAINS:
         return False
     
     # Check that responses are valid (1-5 for MCQ, 0-3 for descriptive)
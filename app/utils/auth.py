@@ -1,18 +1,17 @@
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from ..core.config import settings
+# Re-exported for callers that import password helpers from here; the shared
+# implementation lives in app.core.security.
+from ..core.security import pwd_context, verify_password, get_password_hash
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    """Generate password hash."""
-    return pwd_context.hash(password)
+# Hoisted once at import so encode/decode calls don't re-read settings.
+_SECRET_KEY = settings.jwt_secret_key
+_ALGORITHM = settings.jwt_algorithm
+_ALGORITHMS = [settings.jwt_algorithm]
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
@@ -23,7 +22,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_ALGORITHM)
     return encoded_jwt
 
 def create_refresh_token(data: dict) -> str:
@@ -31,21 +30,36 @@ def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_ALGORITHM)
     return encoded_jwt
 
+@lru_cache(maxsize=4096)
+def _decode(token: str) -> dict:
+    """Signature-check and decode a token, memoized per token string.
+
+    Every authenticated request repeats the same HMAC + JSON parse for the
+    life of a session, so the payload is cached; expiry is checked lazily by
+    the callers instead of at decode time. Cache memory is bounded at 4096
+    token/payload pairs (well under a megabyte).
+    """
+    return jwt.decode(
+        token, _SECRET_KEY, algorithms=_ALGORITHMS,
+        options={"verify_exp": False}
+    )
+
 def verify_token(token: str) -> Optional[dict]:
     """Verify JWT token and return payload."""
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload
+        payload = _decode(token)
     except JWTError:
         return None
+    if payload.get("exp", 0) <= time.time():
+        return None
+    return payload
 
 def get_token_payload(token: str) -> Optional[dict]:
     """Get token payload without verification (for refresh tokens)."""
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload
+        return _decode(token)
     except JWTError:
         return None 
\ No newline at end of file
@@ -1,17 +1,31 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    connect_to_redis,
+    close_redis_connection,
+)
+from app.services.assessment_service import AssessmentService
+from app.services.user_service import get_user_service
 from app.api import auth, assessment, admin
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    await connect_to_redis()
+    # Built once per process and shared by every request via app.state, so
+    # all handlers reuse the same driver pool and crypt context.
+    app.state.user_service = get_user_service()
+    app.state.assessment_service = AssessmentService()
     yield
     # Shutdown
+    await close_redis_connection()
     await close_mongo_connection()
 
 app = FastAPI(
@@ -20,6 +34,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 